@@ -4,11 +4,12 @@ Loads environment variables and provides typed configuration.
 """
 
 import os
-from typing import List
+import functools
+from typing import List, Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# NewsAPI sources used when APPROVED_SOURCES is not set
+DEFAULT_NEWSAPI_SOURCES = "the-new-york-times,the-guardian,bbc-news,fox-news,al-jazeera-english"
 
 class Config:
     """Configuration class with typed environment variables."""
@@ -18,10 +19,24 @@ class Config:
         self.NEWSAPI_KEY = os.getenv('NEWSAPI_KEY', '')
         self.NYT_API_KEY = os.getenv('NYT_API_KEY', '')
         self.APPROVED_SOURCES = self._parse_approved_sources()
+        # NewsAPI `sources` parameter, deduplicated once; defaults to major news sources
+        self.APPROVED_SOURCES_CSV = ",".join(dict.fromkeys(self.APPROVED_SOURCES)) or DEFAULT_NEWSAPI_SOURCES
         
         # LLM (OpenAI)
         self.OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
         self.OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+        # Articles shorter than the threshold (in characters) go to the cheaper model
+        self.OPENAI_MODEL_CHEAP = os.getenv('OPENAI_MODEL_CHEAP', 'gpt-4o-mini')
+        self.LONG_ARTICLE_THRESHOLD = int(os.getenv('LONG_ARTICLE_THRESHOLD', '4000'))
+        self.MAX_FULLTEXT_TOKENS = int(os.getenv('MAX_FULLTEXT_TOKENS', '2500'))
+        self.OPENAI_CONCURRENCY = int(os.getenv('OPENAI_CONCURRENCY', '4'))
+        self.ARTICLES_PER_CALL = int(os.getenv('ARTICLES_PER_CALL', '1'))
+        self.HTTPX_MAX_CONNECTIONS = int(os.getenv('HTTPX_MAX_CONNECTIONS', '100'))
+        self.HTTPX_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('HTTPX_MAX_KEEPALIVE_CONNECTIONS', '50'))
+        self.OPENAI_MAX_REQUESTS_PER_MINUTE = int(os.getenv('OPENAI_MAX_REQUESTS_PER_MINUTE', '500'))
+        self.OPENAI_MAX_TOKENS_PER_MINUTE = int(os.getenv('OPENAI_MAX_TOKENS_PER_MINUTE', '200000'))
+        self.OPENAI_USE_BATCH = os.getenv('OPENAI_USE_BATCH', 'false').lower() in ('1', 'true', 'yes')
+        self.OPENAI_BATCH_MAX_WAIT_SECONDS = int(os.getenv('OPENAI_BATCH_MAX_WAIT_SECONDS', '3600'))
         
         # Email
         self.SENDGRID_API_KEY = os.getenv('SENDGRID_API_KEY', '')
@@ -32,6 +47,11 @@ class Config:
         # Behavior
         self.MAX_ARTICLES = int(os.getenv('MAX_ARTICLES', '5'))
         self.MIN_CHARS_PER_ARTICLE = int(os.getenv('MIN_CHARS_PER_ARTICLE', '500'))
+        
+        # Caching (set a path empty to disable that cache)
+        self.FEED_CACHE_PATH = os.path.expanduser(os.getenv('FEED_CACHE_PATH', '~/.cache/daily-news-analyst/feeds'))
+        self.SUMMARY_CACHE_DIR = os.path.expanduser(os.getenv('SUMMARY_CACHE_DIR', '~/.cache/daily-news-analyst/summaries'))
+        self.SUMMARY_CACHE_TTL_SECONDS = int(os.getenv('SUMMARY_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
     
     def _parse_approved_sources(self) -> List[str]:
         """Parse approved sources from comma-separated string."""
@@ -40,15 +60,24 @@ class Config:
             return []
         return [s.strip() for s in sources_str.split(',') if s.strip()]
     
-    def validate(self) -> bool:
-        """Validate that required configuration is present."""
-        required_fields = [
-            'NEWSAPI_KEY',
-            'OPENAI_API_KEY', 
-            'SENDGRID_API_KEY',
-            'EMAIL_TO',
-            'EMAIL_FROM'
-        ]
+    def validate(self, required_fields: Optional[List[str]] = None) -> bool:
+        """
+        Validate that required configuration is present.
+        
+        Args:
+            required_fields: Names of the fields this run needs; defaults to all keys
+            
+        Returns:
+            True if every required field is set
+        """
+        if required_fields is None:
+            required_fields = [
+                'NEWSAPI_KEY',
+                'OPENAI_API_KEY', 
+                'SENDGRID_API_KEY',
+                'EMAIL_TO',
+                'EMAIL_FROM'
+            ]
         
         missing = []
         for field in required_fields:
@@ -61,5 +90,17 @@ class Config:
         
         return True
 
+@functools.cache
+def get_config() -> Config:
+    """Build the configuration on first use, loading the .env file first."""
+    load_dotenv()
+    return Config()
+
+class _LazyConfig:
+    """Stand-in for the global Config that defers building it until first attribute access."""
+    
+    def __getattr__(self, name):
+        return getattr(get_config(), name)
+
 # Global configuration instance
-CFG = Config()
+CFG = _LazyConfig()
@@ -3,18 +3,47 @@ Email module for rendering HTML templates and sending emails via SendGrid.
 """
 
 import os
+import re
+import functools
 from datetime import datetime
 from typing import List, Dict
 import logging
-from jinja2 import Environment, FileSystemLoader
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content
 
 from .config import CFG
+from .session import get_session
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Template environment is built once per process; templates ship with the
+# package, so there is no need to stat them for changes on every render
+_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "..", "templates")
+
+@functools.cache
+def _get_jinja_env():
+    """Return the shared Jinja2 environment, importing Jinja2 on first use."""
+    from jinja2 import Environment, FileSystemLoader
+    return Environment(loader=FileSystemLoader(_TEMPLATE_DIR), auto_reload=False, cache_size=50)
+
+@functools.lru_cache(maxsize=4)
+def _get_template(name: str):
+    """Return the compiled template, compiling it on first use."""
+    return _get_jinja_env().get_template(name)
+
+# Keywords for categorization, in priority order
+CATEGORY_KEYWORDS = [
+    ("Chips & Hardware", ["chip", "gpu", "cpu", "processor", "hardware", "nvidia", "amd", "intel", "semiconductor"]),
+    ("Policy & Regulation", ["regulation", "policy", "law", "government", "fcc", "ftc", "congress", "senate", "legislation"]),
+    ("Big Models & Platforms", ["gpt", "llm", "openai", "anthropic", "google", "meta", "microsoft", "large language model", "foundation model"]),
+]
+DEFAULT_CATEGORY = "General Tech/AI"
+
+# One alternation per category so each article is scanned in a single pass per category
+_CATEGORY_PATTERNS = [
+    (name, re.compile("|".join(re.escape(keyword) for keyword in keywords)))
+    for name, keywords in CATEGORY_KEYWORDS
+]
+
 def categorize_articles(articles: List[Dict]) -> Dict[str, List[Dict]]:
     """
     Categorize articles into sections based on simple keyword heuristics.
@@ -25,43 +54,19 @@ def categorize_articles(articles: List[Dict]) -> Dict[str, List[Dict]]:
     Returns:
         Dictionary mapping category names to lists of articles
     """
-    categories = {
-        "Chips & Hardware": [],
-        "Policy & Regulation": [],
-        "Big Models & Platforms": [],
-        "General Tech/AI": []
-    }
-    
-    # Keywords for categorization
-    chip_keywords = ["chip", "gpu", "cpu", "processor", "hardware", "nvidia", "amd", "intel", "semiconductor"]
-    policy_keywords = ["regulation", "policy", "law", "government", "fcc", "ftc", "congress", "senate", "legislation"]
-    big_model_keywords = ["gpt", "llm", "openai", "anthropic", "google", "meta", "microsoft", "large language model", "foundation model"]
+    categories = {name: [] for name, _ in _CATEGORY_PATTERNS}
+    categories[DEFAULT_CATEGORY] = []
     
     for article in articles:
-        title_lower = article.get("title", "").lower()
-        summary_lower = article.get("summary", "").lower()
-        text_to_check = title_lower + " " + summary_lower
+        text_to_check = article.get("title", "").lower() + " " + article.get("summary", "").lower()
         
-        categorized = False
-        
-        # Check for chip/hardware keywords
-        if any(keyword in text_to_check for keyword in chip_keywords):
-            categories["Chips & Hardware"].append(article)
-            categorized = True
-        
-        # Check for policy/regulation keywords
-        elif any(keyword in text_to_check for keyword in policy_keywords):
-            categories["Policy & Regulation"].append(article)
-            categorized = True
-        
-        # Check for big model/platform keywords
-        elif any(keyword in text_to_check for keyword in big_model_keywords):
-            categories["Big Models & Platforms"].append(article)
-            categorized = True
-        
-        # Default to general tech/AI
-        if not categorized:
-            categories["General Tech/AI"].append(article)
+        # First matching category wins, in priority order
+        for name, pattern in _CATEGORY_PATTERNS:
+            if pattern.search(text_to_check):
+                categories[name].append(article)
+                break
+        else:
+            categories[DEFAULT_CATEGORY].append(article)
     
     # Remove empty categories
     return {k: v for k, v in categories.items() if v}
@@ -77,10 +82,7 @@ def render_email_html(articles: List[Dict], date_str: str) -> str:
     Returns:
         Rendered HTML string
     """
-    # Get template directory
-    template_dir = os.path.join(os.path.dirname(__file__), "..", "templates")
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("email.html")
+    template = _get_template("email.html")
     
     # Categorize articles
     sections = categorize_articles(articles)
@@ -114,8 +116,11 @@ def send_email(html: str, subject: str = "Your Daily News Brief") -> bool:
         return False
     
     try:
+        # Imported on first use, inside the try so a missing package fails like any other send error
+        from sendgrid import SendGridAPIClient
+        from sendgrid.helpers.mail import Mail, Email, To, Content
+        
         # Sanitize subject and content to prevent header issues
-        import re
         sanitized_subject = re.sub(r'[^\x20-\x7E]', '', subject)[:100]  # Remove non-ASCII chars, limit length
         sanitized_html = re.sub(r'[^\x20-\x7E\xA0-\xFF]', '', html)  # Remove problematic chars but keep some Unicode
         
@@ -143,7 +148,6 @@ def send_email(html: str, subject: str = "Your Daily News Brief") -> bool:
             if "proxies" in str(e):
                 # Handle SendGrid version compatibility issue
                 logger.warning("SendGrid version compatibility issue detected, trying alternative approach")
-                import requests
                 headers = {
                     'Authorization': f'Bearer {CFG.SENDGRID_API_KEY}',
                     'Content-Type': 'application/json'
@@ -154,7 +158,7 @@ def send_email(html: str, subject: str = "Your Daily News Brief") -> bool:
                     'subject': sanitized_subject,
                     'content': [{'type': 'text/html', 'value': sanitized_html}]
                 }
-                response = requests.post('https://api.sendgrid.com/v3/mail/send', headers=headers, json=data)
+                response = get_session().post('https://api.sendgrid.com/v3/mail/send', headers=headers, json=data, timeout=30)
                 if response.status_code in [200, 201, 202]:
                     logger.info(f"Email sent successfully to {CFG.EMAIL_TO}")
                     return True
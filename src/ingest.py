@@ -4,17 +4,33 @@ Handles NewsAPI, RSS feeds, text extraction, and deduplication.
 """
 
 import requests
-import feedparser
-import trafilatura
-from bs4 import BeautifulSoup
 from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from typing import List, Dict, Optional
-from tqdm import tqdm
+from typing import List, Dict, Optional, Tuple
+import os
+import re
+import sys
+import html
+import heapq
+import shelve
 import time
+import functools
+import threading
 import logging
 
+try:
+    import xxhash
+except ImportError:  # optional, falls back to the builtin hash
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to requests' stdlib json
+    orjson = None
+
 from .config import CFG
+from .session import get_session, get_page_session
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,6 +54,71 @@ DEFAULT_RSS_FEEDS = [
     "https://www.aljazeera.com/xml/rss/world.xml",  # Al Jazeera World
 ]
 
+# Keywords to prioritize important news (politics, world events, tech, etc.)
+PRIORITY_KEYWORDS = [
+    "politics", "election", "government", "president", "congress", "senate",
+    "world", "global", "international", "foreign", "diplomacy", "trade",
+    "technology", "science", "innovation", "AI", "artificial intelligence",
+    "climate", "economy", "business", "finance", "market",
+    "breaking", "urgent", "crisis", "emergency", "important", "major"
+]
+
+# Case-insensitive match of any priority keyword at a word start, allowing plural and
+# adjective endings ("elections", "businesses", "presidential", "congressional"); keywords
+# ending in "y" also match their "-ies" plural ("economies"). Each alternative captures the
+# keyword's stem in one of the two groups, so different forms count as one keyword
+_PRIORITY_RE = re.compile(
+    r'\b(?:(' + '|'.join(re.escape(k) for k in PRIORITY_KEYWORDS if not k.endswith('y')) + r')(?:s|es|al|ial|ional)?'
+    r'|(' + '|'.join(re.escape(k[:-1]) for k in PRIORITY_KEYWORDS if k.endswith('y')) + r')(?:y|ies))\b',
+    re.IGNORECASE
+)
+
+# Publisher suffixes stripped from titles before deduplication, e.g. "... | TechCrunch"
+_SUFFIX_RE = re.compile(r'\s+[-|]\s+(?:The Verge|TechCrunch|Ars Technica|Wired|Engadget)\s*$', re.IGNORECASE)
+
+# Tag and whitespace patterns for flattening RSS summaries to plain text
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Stand-in date for articles without one, so they sort as oldest
+_MIN_DT = datetime.min.replace(tzinfo=timezone.utc)
+
+# Full-text extraction concurrency and the pause between requests to the same host
+FULLTEXT_WORKERS = 8
+HOST_FETCH_DELAY = 0.1
+
+# Largest page downloaded for extraction, matching trafilatura's own fetch_url limit
+FULLTEXT_MAX_BYTES = 20_000_000
+
+# datetime.fromisoformat accepts a trailing "Z" from Python 3.11 on
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+def _parse_iso(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp as returned by NewsAPI and the NYT API.
+    
+    Args:
+        value: Timestamp string, possibly ending in "Z"
+        
+    Returns:
+        Parsed datetime
+        
+    Raises:
+        ValueError: If the string is not a valid timestamp
+    """
+    if _FROMISOFORMAT_ACCEPTS_Z:
+        return datetime.fromisoformat(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def _parse_json(response: requests.Response) -> Dict:
+    """Decode a JSON API response, using orjson when it is available."""
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # let requests raise its RequestException subclass below
+    return response.json()
+
 def fetch_nyt_articles(query: str) -> List[Dict]:
     """
     Fetch articles from New York Times API.
@@ -62,9 +143,9 @@ def fetch_nyt_articles(query: str) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = get_session().get(url, params=params, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = _parse_json(response)
         
         articles = []
         for doc in data.get("response", {}).get("docs", []):
@@ -72,9 +153,7 @@ def fetch_nyt_articles(query: str) -> List[Dict]:
             published_at = None
             if doc.get("pub_date"):
                 try:
-                    published_at = datetime.fromisoformat(
-                        doc["pub_date"].replace("Z", "+00:00")
-                    )
+                    published_at = _parse_iso(doc["pub_date"])
                 except ValueError:
                     published_at = datetime.now(timezone.utc)
             
@@ -116,19 +195,13 @@ def fetch_newsapi_articles(query: str) -> List[Dict]:
         "language": "en",
         "sortBy": "publishedAt",
         "pageSize": 50,  # Get more articles for better selection
+        "sources": CFG.APPROVED_SOURCES_CSV,
     }
     
-    # Add approved sources if configured
-    if CFG.APPROVED_SOURCES:
-        params["sources"] = ",".join(CFG.APPROVED_SOURCES)
-    else:
-        # Default to major news sources if no approved sources specified
-        params["sources"] = "the-new-york-times,the-guardian,bbc-news,fox-news,al-jazeera-english"
-    
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = get_session().get(url, params=params, timeout=30)
         response.raise_for_status()
-        data = response.json()
+        data = _parse_json(response)
         
         if data.get("status") != "ok":
             logger.error(f"NewsAPI error: {data.get('message', 'Unknown error')}")
@@ -140,9 +213,7 @@ def fetch_newsapi_articles(query: str) -> List[Dict]:
             published_at = None
             if article.get("publishedAt"):
                 try:
-                    published_at = datetime.fromisoformat(
-                        article["publishedAt"].replace("Z", "+00:00")
-                    )
+                    published_at = _parse_iso(article["publishedAt"])
                 except ValueError:
                     published_at = datetime.now(timezone.utc)
             
@@ -163,52 +234,127 @@ def fetch_newsapi_articles(query: str) -> List[Dict]:
         logger.error(f"Error fetching from NewsAPI: {e}")
         return []
 
-def fetch_rss(urls: List[str]) -> List[Dict]:
+def _strip_html(markup: str) -> str:
+    """Reduce a short HTML fragment such as an RSS summary to plain text."""
+    return _WS_RE.sub(' ', html.unescape(_TAG_RE.sub(' ', markup))).strip()
+
+def _parse_one_feed(url: str, cached: Optional[Dict] = None) -> Tuple[List[Dict], Optional[Dict]]:
     """
-    Fetch articles from RSS feeds.
+    Fetch and parse a single RSS feed, revalidating against a cached copy.
     
     Args:
-        urls: List of RSS feed URLs
+        url: RSS feed URL
+        cached: Previous cache entry for this feed with etag, modified, and articles
         
     Returns:
-        List of article dictionaries
+        Tuple of (articles, cache entry to store or None). Articles are empty if
+        the feed could not be fetched.
     """
+    import feedparser
+    
+    cached = cached or {}
     articles = []
     
-    for url in urls:
-        try:
-            logger.info(f"Fetching RSS feed: {url}")
-            feed = feedparser.parse(url)
+    try:
+        logger.info(f"Fetching RSS feed: {url}")
+        feed = feedparser.parse(url, etag=cached.get("etag"), modified=cached.get("modified"))
+        
+        # Server confirmed nothing changed since the cached copy
+        if feed.get("status") == 304 and "articles" in cached:
+            logger.info(f"RSS feed not modified, using cached entries: {url}")
+            return cached["articles"], None
+        
+        for entry in feed.entries:
+            # Parse published date
+            published_at = None
+            if hasattr(entry, 'published_parsed') and entry.published_parsed:
+                published_at = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
+            elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+                published_at = datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
+            else:
+                published_at = datetime.now(timezone.utc)
             
-            for entry in feed.entries:
-                # Parse published date
-                published_at = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    published_at = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    published_at = datetime(*entry.updated_parsed[:6], tzinfo=timezone.utc)
-                else:
-                    published_at = datetime.now(timezone.utc)
-                
-                # Clean description with BeautifulSoup
-                description = ""
-                if hasattr(entry, 'summary'):
-                    soup = BeautifulSoup(entry.summary, 'html.parser')
-                    description = soup.get_text().strip()
-                
-                articles.append({
-                    "title": getattr(entry, 'title', '').strip(),
-                    "url": getattr(entry, 'link', ''),
-                    "source": feed.feed.get('title', 'Unknown RSS'),
-                    "published_at": published_at,
-                    "description": description,
-                    "content": "",  # RSS feeds don't provide full content
-                    "source_type": "rss"
-                })
-                
-        except Exception as e:
-            logger.error(f"Error fetching RSS feed {url}: {e}")
-            continue
+            # Strip markup from the summary
+            description = ""
+            if hasattr(entry, 'summary'):
+                description = _strip_html(entry.summary)
+            
+            articles.append({
+                "title": getattr(entry, 'title', '').strip(),
+                "url": getattr(entry, 'link', ''),
+                "source": feed.feed.get('title', 'Unknown RSS'),
+                "published_at": published_at,
+                "description": description,
+                "content": "",  # RSS feeds don't provide full content
+                "source_type": "rss"
+            })
+            
+    except Exception as e:
+        logger.error(f"Error fetching RSS feed {url}: {e}")
+        return [], None
+    
+    # Only worth caching if the server gave us validators to send next time
+    cache_entry = None
+    if articles and (feed.get("etag") or feed.get("modified")):
+        cache_entry = {
+            "etag": feed.get("etag"),
+            "modified": feed.get("modified"),
+            "articles": articles,
+        }
+    
+    return articles, cache_entry
+
+def _open_feed_cache() -> Optional[shelve.Shelf]:
+    """
+    Open the on-disk RSS feed cache.
+    
+    Returns:
+        Open shelf, or None if caching is disabled or the cache is unavailable
+    """
+    if not CFG.FEED_CACHE_PATH:
+        return None
+    
+    try:
+        os.makedirs(os.path.dirname(CFG.FEED_CACHE_PATH) or ".", exist_ok=True)
+        return shelve.open(CFG.FEED_CACHE_PATH)
+    except Exception as e:
+        logger.warning(f"RSS feed cache unavailable at {CFG.FEED_CACHE_PATH}: {e}")
+        return None
+
+def fetch_rss(urls: List[str]) -> List[Dict]:
+    """
+    Fetch articles from RSS feeds concurrently.
+    
+    Feeds whose ETag/Last-Modified validators show no change since the last
+    run are served from the on-disk cache instead of being re-parsed.
+    
+    Args:
+        urls: List of RSS feed URLs
+        
+    Returns:
+        List of article dictionaries, in feed order
+    """
+    if not urls:
+        return []
+    
+    cache = _open_feed_cache()
+    try:
+        # Read cached entries up front; shelve is not safe to share across threads
+        previous = {url: cache.get(url) for url in urls} if cache is not None else {}
+        
+        # Feed fetches are network-bound, so overlap them instead of waiting on each in turn
+        with ThreadPoolExecutor(max_workers=min(16, len(urls))) as executor:
+            results = list(executor.map(lambda url: _parse_one_feed(url, previous.get(url)), urls))
+        
+        if cache is not None:
+            for url, (_, cache_entry) in zip(urls, results):
+                if cache_entry is not None:
+                    cache[url] = cache_entry
+    finally:
+        if cache is not None:
+            cache.close()
+    
+    articles = [article for feed_articles, _ in results for article in feed_articles]
     
     logger.info(f"Fetched {len(articles)} articles from RSS feeds")
     return articles
@@ -224,10 +370,14 @@ def extract_fulltext(url: str, timeout: int = 10) -> Optional[str]:
     Returns:
         Extracted text or None if extraction failed
     """
+    # Imported on first use; trafilatura is slow to import and only needed for enrichment
+    import trafilatura
+    
     try:
-        extracted = trafilatura.fetch_url(url, timeout=timeout)
-        if extracted:
-            text = trafilatura.extract(extracted, include_links=False, include_images=False)
+        # Download through the shared page session so connections are reused across articles
+        content = _download_page(url, timeout)
+        if content:
+            text = trafilatura.extract(content, include_links=False, include_images=False)
             if text:
                 return text.strip()
     except Exception as e:
@@ -235,6 +385,44 @@ def extract_fulltext(url: str, timeout: int = 10) -> Optional[str]:
     
     return None
 
+def _download_page(url: str, timeout: int) -> Optional[bytes]:
+    """
+    Download an HTML page body, skipping non-HTML and oversized responses.
+    
+    Headers are checked before the body is read, and the body is read in chunks
+    up to FULLTEXT_MAX_BYTES, so linked PDFs and videos are never pulled into memory.
+    
+    Args:
+        url: URL to download
+        timeout: Request timeout in seconds
+        
+    Returns:
+        Response body, or None if the request failed or the response was rejected
+    """
+    with get_page_session().get(url, timeout=timeout, stream=True) as response:
+        if not response.ok:
+            return None
+        
+        content_type = response.headers.get("Content-Type", "").lower()
+        if content_type and "html" not in content_type and "xml" not in content_type:
+            logger.debug(f"Skipping {url}: unsupported content type {content_type}")
+            return None
+        
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit() and int(content_length) > FULLTEXT_MAX_BYTES:
+            logger.debug(f"Skipping {url}: {content_length} bytes exceeds {FULLTEXT_MAX_BYTES}")
+            return None
+        
+        # Content-Length may be missing or wrong, so enforce the cap while reading too
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=65536):
+            body.extend(chunk)
+            if len(body) > FULLTEXT_MAX_BYTES:
+                logger.debug(f"Skipping {url}: body exceeds {FULLTEXT_MAX_BYTES} bytes")
+                return None
+        
+        return bytes(body)
+
 def normalize_url(url: str) -> str:
     """
     Normalize URL by removing query parameters and fragments.
@@ -251,6 +439,22 @@ def normalize_url(url: str) -> str:
     except Exception:
         return url
 
+def _fingerprint(text: str) -> int:
+    """64-bit fingerprint of a normalized URL or title, used as a dedupe key."""
+    if xxhash is not None:
+        return xxhash.xxh64_intdigest(text)
+    # Builtin hash is randomized per process, which is fine for in-run dedupe
+    return hash(text)
+
+def _priority_score(title: str) -> int:
+    """Count the distinct priority keywords appearing in a title."""
+    return len({(stem or y_stem).lower() for stem, y_stem in _PRIORITY_RE.findall(title)})
+
+def _published_key(item: Dict) -> datetime:
+    """Sort key placing undated articles last."""
+    return item.get("published_at") or _MIN_DT
+
+@functools.lru_cache(maxsize=4096)
 def normalize_title(title: str) -> str:
     """
     Normalize title for deduplication by removing common suffixes and normalizing case.
@@ -261,69 +465,82 @@ def normalize_title(title: str) -> str:
     Returns:
         Normalized title
     """
-    # Remove common suffixes
-    suffixes = [" - The Verge", " | TechCrunch", " | Ars Technica", " | Wired", " | Engadget"]
-    normalized = title
-    for suffix in suffixes:
-        if normalized.endswith(suffix):
-            normalized = normalized[:-len(suffix)]
-            break
-    
-    return normalized.lower().strip()
+    return _SUFFIX_RE.sub('', title, count=1).lower().strip()
 
-def normalize_and_dedupe(items: List[Dict]) -> List[Dict]:
+def normalize_and_dedupe(items: List[Dict], limit: Optional[int] = None) -> List[Dict]:
     """
     Normalize and deduplicate articles by URL and title.
     Prioritize tech/science articles.
     
     Args:
         items: List of article dictionaries
+        limit: If given, return only the top `limit` articles
         
     Returns:
-        Deduplicated list of articles
+        Deduplicated list of articles, highest priority first
     """
+    # Date column first, so the sweep below orders indices rather than article dicts
+    published = [_published_key(item) for item in items]
+    
+    # Single sweep from newest to oldest: keep an article unless a newer kept
+    # one has the same URL or a very similar title. A URL whose newest version
+    # loses on title still gets its next-newest version considered.
     seen_urls = set()
     seen_titles = set()
-    deduplicated = []
-    
-    # Keywords to prioritize important news (politics, world events, tech, etc.)
-    priority_keywords = [
-        "politics", "election", "government", "president", "congress", "senate",
-        "world", "global", "international", "foreign", "diplomacy", "trade",
-        "technology", "science", "innovation", "AI", "artificial intelligence", 
-        "climate", "economy", "business", "finance", "market", "trade",
-        "breaking", "urgent", "crisis", "emergency", "important", "major"
-    ]
-    
-    # Sort by published_at (newest first) to keep the most recent version
-    items.sort(key=lambda x: x.get("published_at") or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
-    
-    for item in items:
-        normalized_url = normalize_url(item["url"])
-        normalized_title = normalize_title(item["title"])
-        
-        # Skip if we've seen this URL or very similar title
-        if normalized_url in seen_urls:
+    survivors = []
+    for i in sorted(range(len(items)), key=published.__getitem__, reverse=True):
+        url_hash = _fingerprint(normalize_url(items[i]["url"]))
+        if url_hash in seen_urls:
             continue
         
-        if normalized_title in seen_titles:
+        title_hash = _fingerprint(normalize_title(items[i]["title"]))
+        if title_hash in seen_titles:
             continue
         
-        # Add priority score for tech/science articles
-        title_lower = item.get("title", "").lower()
-        priority_score = sum(1 for keyword in priority_keywords if keyword in title_lower)
-        item["priority_score"] = priority_score
-        
-        seen_urls.add(normalized_url)
-        seen_titles.add(normalized_title)
-        deduplicated.append(item)
+        seen_urls.add(url_hash)
+        seen_titles.add(title_hash)
+        survivors.append(i)
+    
+    # Add priority score for tech/science articles
+    scores = {i: _priority_score(items[i].get("title", "")) for i in survivors}
+    
+    logger.info(f"Deduplicated {len(items)} articles to {len(survivors)}")
     
-    # Sort by priority score (highest first), then by date
-    deduplicated.sort(key=lambda x: (x.get("priority_score", 0), x.get("published_at") or datetime.min.replace(tzinfo=timezone.utc)), reverse=True)
+    # Order by priority score (highest first), then by date; a heap avoids
+    # sorting everything when only the top few are kept
+    def rank(i):
+        return (scores[i], published[i])
+    
+    if limit is not None and limit < len(survivors):
+        logger.info(f"Limiting to {limit} articles (from {len(survivors)})")
+        order = heapq.nlargest(limit, survivors, key=rank)
+    else:
+        order = sorted(survivors, key=rank, reverse=True)
+    
+    deduplicated = []
+    for i in order:
+        items[i]["priority_score"] = scores[i]
+        deduplicated.append(items[i])
     
-    logger.info(f"Deduplicated {len(items)} articles to {len(deduplicated)}")
     return deduplicated
 
+def _fetch_politely(url: str, host_locks: Dict[str, threading.Semaphore]) -> Optional[str]:
+    """
+    Extract full text while holding the URL's per-host lock.
+    
+    Args:
+        url: URL to extract text from
+        host_locks: Mapping of host name to the semaphore serializing its fetches
+        
+    Returns:
+        Extracted text or None if extraction failed
+    """
+    with host_locks[urlparse(url).netloc]:
+        text = extract_fulltext(url)
+        # Small delay to be respectful to servers
+        time.sleep(HOST_FETCH_DELAY)
+    return text
+
 def enrich_with_text(items: List[Dict], min_chars: int = 100) -> List[Dict]:
     """
     Enrich articles with full text content, preferring existing content over extraction.
@@ -335,32 +552,53 @@ def enrich_with_text(items: List[Dict], min_chars: int = 100) -> List[Dict]:
     Returns:
         List of articles with fulltext added
     """
-    enriched = []
+    fulltexts = {}
+    needs_fetch = []
     
-    for item in tqdm(items, desc="Enriching articles with full text"):
-        fulltext = ""
-        
-        # Prefer existing content from NewsAPI or NYT API
+    # Prefer existing content from NewsAPI or NYT API; only fetch when it is too short
+    for i, item in enumerate(items):
         if item.get("content") and len(item["content"]) > min_chars:
-            fulltext = item["content"]
+            fulltexts[i] = item["content"]
         elif item.get("description") and len(item["description"]) > min_chars:
-            fulltext = item["description"]
+            fulltexts[i] = item["description"]
         else:
-            # Try to extract full text as last resort
-            extracted = extract_fulltext(item["url"])
-            if extracted and len(extracted) > min_chars:
-                fulltext = extracted
-            elif item.get("description"):  # Use description even if short
-                fulltext = item["description"]
+            needs_fetch.append(i)
+    
+    if needs_fetch:
+        # Fetch different hosts concurrently, but one request at a time per host
+        host_locks = {urlparse(items[i]["url"]).netloc: threading.Semaphore(1) for i in needs_fetch}
+        
+        with ThreadPoolExecutor(max_workers=min(FULLTEXT_WORKERS, len(needs_fetch))) as executor:
+            futures = {
+                executor.submit(_fetch_politely, items[i]["url"], host_locks): i
+                for i in needs_fetch
+            }
+            
+            completed = as_completed(futures)
+            
+            # Progress bar only helps an interactive terminal, not cron/CI logs
+            if sys.stderr.isatty():
+                from tqdm import tqdm
+                completed = tqdm(completed, total=len(futures), desc="Enriching articles with full text")
+            
+            for future in completed:
+                i = futures[future]
+                extracted = future.result()
+                if extracted and len(extracted) > min_chars:
+                    fulltexts[i] = extracted
+                elif items[i].get("description"):  # Use description even if short
+                    fulltexts[i] = items[i]["description"]
+    
+    enriched = []
+    
+    for i, item in enumerate(items):
+        fulltext = fulltexts.get(i)
         
         if fulltext:
             item["fulltext"] = fulltext
             enriched.append(item)
         else:
             logger.debug(f"Skipping article with insufficient content: {item['title']}")
-        
-        # Small delay to be respectful to servers
-        time.sleep(0.1)
     
     logger.info(f"Enriched {len(enriched)} articles with full text")
     return enriched
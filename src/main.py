@@ -75,17 +75,7 @@ def process_articles(articles: List[Dict], max_articles: int, min_chars: int) ->
     """
     # Deduplicate articles
     logger.info("Deduplicating articles...")
-    deduplicated = normalize_and_dedupe(articles)
-    
-    # Sort by published date (newest first) and limit
-    deduplicated.sort(
-        key=lambda x: x.get("published_at") or datetime.min.replace(tzinfo=datetime.utc),
-        reverse=True
-    )
-    
-    if len(deduplicated) > max_articles:
-        logger.info(f"Limiting to {max_articles} articles (from {len(deduplicated)})")
-        deduplicated = deduplicated[:max_articles]
+    deduplicated = normalize_and_dedupe(articles, limit=max_articles)
     
     # Enrich with full text
     logger.info("Enriching articles with full text...")
@@ -141,8 +131,12 @@ def main():
     
     args = parser.parse_args()
     
-    # Validate configuration
-    if not args.preview and not CFG.validate():
+    # Validate only the configuration this run actually uses
+    required = ['OPENAI_API_KEY', 'SENDGRID_API_KEY', 'EMAIL_TO', 'EMAIL_FROM']
+    if not args.rss_only:
+        required.append('NEWSAPI_KEY')
+    
+    if not args.preview and not CFG.validate(required):
         logger.error("Configuration validation failed")
         sys.exit(1)
     
@@ -0,0 +1,62 @@
+"""
+Shared HTTP sessions for outbound requests.
+Reuse pooled keep-alive connections and retry transient failures.
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Browser-like User-Agent for article pages; many publishers reject the python-requests default
+PAGE_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+_session = None
+_page_session = None
+_session_lock = threading.Lock()
+
+def _build_session(max_retries: Retry) -> requests.Session:
+    """Create a session with a pooled adapter mounted for HTTP and HTTPS."""
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=max_retries
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide requests session for API calls, creating it on first use.
+    
+    Returns:
+        Session with a pooled, retrying adapter mounted for HTTP and HTTPS
+    """
+    global _session
+    
+    with _session_lock:
+        if _session is None:
+            _session = _build_session(Retry(total=3, backoff_factor=0.3))
+    
+    return _session
+
+def get_page_session() -> requests.Session:
+    """
+    Return the process-wide requests session for article page downloads, creating it on first use.
+    
+    Pages are fetched with a browser-like User-Agent and retried at most once,
+    so a slow site costs at most two timeouts.
+    
+    Returns:
+        Session with a pooled adapter mounted for HTTP and HTTPS
+    """
+    global _page_session
+    
+    with _session_lock:
+        if _page_session is None:
+            _page_session = _build_session(Retry(total=1, backoff_factor=0.3))
+            _page_session.headers["User-Agent"] = PAGE_USER_AGENT
+    
+    return _page_session
@@ -3,62 +3,741 @@ Article summarization module using OpenAI's Chat Completions API.
 Generates faithful, factual summaries with proper citations.
 """
 
+import asyncio
+import atexit
+import functools
+import hashlib
+import json
+import time
+import threading
+import httpx
 import openai
-from typing import List, Dict
+from tenacity import retry, retry_if_exception, wait_exponential_jitter, stop_after_attempt, before_sleep_log
+from typing import List, Dict, Optional, Tuple, AsyncIterator
 import logging
-import time
 
 from .config import CFG
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-def create_summary_prompt(article: Dict) -> str:
+# Pooled HTTP clients shared by every OpenAI request in the process
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+_client = None
+_client_lock = threading.Lock()
+
+def _http_limits() -> httpx.Limits:
+    """Connection pool limits for OpenAI traffic."""
+    return httpx.Limits(
+        max_connections=CFG.HTTPX_MAX_CONNECTIONS,
+        max_keepalive_connections=CFG.HTTPX_MAX_KEEPALIVE_CONNECTIONS
+    )
+
+def _get_client() -> openai.OpenAI:
+    """
+    Return the process-wide synchronous OpenAI client, creating it on first use.
+    
+    The client wraps one pooled HTTP/2 httpx.Client so connections and TLS
+    sessions are reused across calls; it is closed at interpreter exit.
+    
+    Returns:
+        Shared OpenAI client
+    """
+    global _client
+    
+    with _client_lock:
+        if _client is None:
+            http_client = httpx.Client(limits=_http_limits(), timeout=_HTTP_TIMEOUT, http2=True)
+            atexit.register(http_client.close)
+            _client = openai.OpenAI(api_key=CFG.OPENAI_API_KEY, http_client=http_client)
+    
+    return _client
+
+SYSTEM_PROMPT = """You write faithful, concise news summaries with analysis and citations.
+- Summarize core facts in 3-4 bullets.
+- Provide 1-2 sentences of analysis on the significance or implications.
+- Link to the original source using the provided URL; do not invent sources.
+- Keep analysis balanced and fact-based.
+- Target 120-160 words per article."""
+
+# Prompt templates, filled with str.format_map from an _ArticleFields view
+_ARTICLE_DETAILS_TEMPLATE = """TITLE: {title}
+SOURCE: {source}
+DATE: {date}
+URL: {url}
+
+FULL TEXT:
+{fulltext}"""
+
+_SUMMARY_PROMPT_TEMPLATE = """Please summarize and analyze the following article:
+
+{details}
+
+Please provide a summary and analysis that:
+- Contains 3-4 bullet points of core facts
+- Includes 1-2 sentences of analysis on significance/implications
+- Links to the original source using the provided URL
+- Keeps analysis balanced and fact-based
+- Targets 120-160 words total
+- Includes a citation at the end: [Source: {source}]
+
+Summary and Analysis:"""
+
+class _ArticleFields(dict):
+    """Article view for format_map that fills in placeholders for missing keys."""
+    
+    _DEFAULTS = {"title": "No title", "source": "Unknown source", "url": "No URL"}
+    
+    def __missing__(self, key):
+        return self._DEFAULTS.get(key, "Unknown")
+
+@functools.lru_cache(maxsize=1024)
+def _format_date(published_at) -> str:
+    """Format a publication date for the prompt, once per distinct value."""
+    return published_at.strftime("%B %d, %Y")
+
+def _article_details(article: Dict, model: str) -> str:
+    """
+    Format the title, source, date, URL, and truncated full text of an article.
+    
+    Args:
+        article: Article dictionary with title, source, published_at, url, and fulltext
+        model: Model the prompt is for, whose tokenizer measures the truncation
+        
+    Returns:
+        Article details block for inclusion in a prompt
+    """
+    published_at = article.get("published_at")
+    fields = _ArticleFields(
+        article,
+        date=_format_date(published_at) if published_at else "Unknown date",
+        fulltext=_truncate_tokens(article.get("fulltext", ""), CFG.MAX_FULLTEXT_TOKENS, model),
+    )
+    return _ARTICLE_DETAILS_TEMPLATE.format_map(fields)
+
+def create_summary_prompt(article: Dict, model: Optional[str] = None) -> str:
     """
     Create a prompt for summarizing a single article.
     
     Args:
         article: Article dictionary with title, source, published_at, url, and fulltext
+        model: Model the prompt is for; defaults to the one _choose_model picks
         
     Returns:
         Formatted prompt string
     """
-    # Format the date
-    date_str = "Unknown date"
-    if article.get("published_at"):
-        date_str = article["published_at"].strftime("%B %d, %Y")
+    model = model or _choose_model([article])
+    return _SUMMARY_PROMPT_TEMPLATE.format_map(_ArticleFields(article, details=_article_details(article, model)))
+
+def create_multi_summary_prompt(articles: List[Dict], model: Optional[str] = None) -> str:
+    """
+    Create a prompt for summarizing several articles in one request.
     
-    # Truncate fulltext to ~8k characters to stay within token limits
-    fulltext = article.get("fulltext", "")
-    if len(fulltext) > 8000:
-        fulltext = fulltext[:8000] + "..."
+    Articles are numbered from 1 in the order given; the model is asked to
+    answer with a JSON object whose summaries carry those ids.
     
-    prompt = f"""Please summarize and analyze the following article:
-
-TITLE: {article.get('title', 'No title')}
-SOURCE: {article.get('source', 'Unknown source')}
-DATE: {date_str}
-URL: {article.get('url', 'No URL')}
+    Args:
+        articles: Article dictionaries with title, source, published_at, url, and fulltext
+        model: Model the prompt is for; defaults to the one _choose_model picks
+        
+    Returns:
+        Formatted prompt string
+    """
+    model = model or _choose_model(articles)
+    blocks = "\n\n".join(
+        f"=== ARTICLE {i} ===\n{_article_details(article, model)}"
+        for i, article in enumerate(articles, start=1)
+    )
+    
+    prompt = f"""Please summarize and analyze each of the following {len(articles)} articles independently:
 
-FULL TEXT:
-{fulltext}
+{blocks}
 
-Please provide a summary and analysis that:
+For each article, provide a summary and analysis that:
 - Contains 3-4 bullet points of core facts
 - Includes 1-2 sentences of analysis on significance/implications
 - Links to the original source using the provided URL
 - Keeps analysis balanced and fact-based
 - Targets 120-160 words total
-- Includes a citation at the end: [Source: {article.get('source', 'Unknown')}]
+- Includes a citation at the end: [Source: <the article's SOURCE>]
 
-Summary and Analysis:"""
+Respond with a JSON object of the form
+{{"summaries": [{{"id": <article number>, "text": "<summary and analysis>"}}, ...]}}
+containing exactly one entry per article."""
     
     return prompt
 
+def _chunk(items: List, size: int) -> List[List]:
+    """Split items into consecutive groups of at most `size`."""
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _choose_model(articles: List[Dict]) -> str:
+    """
+    Pick the model for a request: the main model for long articles, the cheaper one otherwise.
+    
+    Args:
+        articles: Article dictionaries with fulltext
+        
+    Returns:
+        OpenAI model name
+    """
+    longest = max(len(article.get("fulltext", "")) for article in articles)
+    if longest >= CFG.LONG_ARTICLE_THRESHOLD:
+        return CFG.OPENAI_MODEL
+    return CFG.OPENAI_MODEL_CHEAP
+
+def _request_body(articles: List[Dict]) -> Dict:
+    """
+    Build the Chat Completions request parameters for a group of articles.
+    
+    A single article gets a plain-text summary prompt; several are packed into
+    one prompt with a JSON response so the system prompt is sent only once.
+    
+    Args:
+        articles: Article dictionaries with fulltext
+        
+    Returns:
+        Keyword arguments for chat.completions.create, also used as a Batch API request body
+    """
+    model = _choose_model(articles)
+    body = {
+        "model": model,
+        "messages": [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": create_summary_prompt(articles[0], model) if len(articles) == 1 else create_multi_summary_prompt(articles, model)
+            }
+        ],
+        "temperature": 0.1,
+        # ~160 words at ~1.5 tokens per word, plus room for the link and citation
+        # lines; replies cut off at this limit are never cached
+        "max_tokens": 512 * len(articles)
+    }
+    
+    if len(articles) > 1:
+        body["response_format"] = {"type": "json_object"}
+    
+    return body
+
+def _prepare_request(articles: List[Dict]) -> Tuple[Dict, int]:
+    """Build the request body for a group of articles along with its token estimate."""
+    body = _request_body(articles)
+    return body, _estimate_tokens(body)
+
+def _parse_summaries(articles: List[Dict], content: str) -> List[str]:
+    """
+    Split a model response into one summary per article.
+    
+    Args:
+        articles: Article dictionaries the request was built from
+        content: Message content returned by the model
+        
+    Returns:
+        Summary strings in the same order as articles; fallbacks for any the model left out
+    """
+    if len(articles) == 1:
+        return [content.strip() or _fallback_summary(articles[0])]
+    
+    texts = {}
+    try:
+        for entry in json.loads(content).get("summaries", []):
+            texts[str(entry.get("id"))] = str(entry.get("text", "")).strip()
+    except (ValueError, AttributeError) as e:
+        logger.error("Could not parse multi-article response: %s", e)
+    
+    return [texts.get(str(i)) or _fallback_summary(article) for i, article in enumerate(articles, start=1)]
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """
+    Return the tiktoken encoding for a model, loading it on first use.
+    
+    Args:
+        model: OpenAI model name
+        
+    Returns:
+        tiktoken Encoding, or None if it could not be loaded
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Newer models tiktoken does not know about yet use the latest encoding
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use, which can fail offline
+        logger.warning("Could not load tokenizer for %s, estimating tokens from length: %s", model, e)
+        return None
+
+def _count_tokens(text: str, model: str) -> int:
+    """Count tokens in text for a model, approximating as 4 characters per token without a tokenizer."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode_ordinary(text))
+
+def _truncate_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    Truncate text to at most max_tokens tokens, marking the cut with "...".
+    
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+        model: OpenAI model whose tokenizer measures the budget
+        
+    Returns:
+        Text unchanged if within budget, otherwise its first max_tokens tokens
+    """
+    encoding = _get_encoding(model)
+    if encoding is None:
+        # Same 4-characters-per-token approximation as _count_tokens
+        max_chars = max_tokens * 4
+        return text if len(text) <= max_chars else text[:max_chars] + "..."
+    
+    # Scraped text may contain strings like "<|endoftext|>"; encode them as plain text
+    ids = encoding.encode_ordinary(text)
+    if len(ids) <= max_tokens:
+        return text
+    # The cut can split a multi-byte character; drop the partial bytes instead of emitting U+FFFD
+    return encoding.decode(ids[:max_tokens], errors="ignore") + "..."
+
+def _estimate_tokens(body: Dict) -> int:
+    """Estimate the tokens a request counts against the TPM limit: prompt plus max completion."""
+    prompt_tokens = sum(_count_tokens(message["content"], body["model"]) for message in body["messages"])
+    return prompt_tokens + body["max_tokens"]
+
+class _RateLimiter:
+    """
+    Token bucket enforcing both requests-per-minute and tokens-per-minute limits.
+    
+    Capacity refills continuously at the per-minute rate; each request debits one
+    request and its estimated tokens up front, waiting only while either bucket
+    is short.
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.max_requests = float(requests_per_minute)
+        self.max_tokens = float(tokens_per_minute)
+        self.available_requests = self.max_requests
+        self.available_tokens = self.max_tokens
+        self.last_update = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.available_requests = min(self.max_requests, self.available_requests + elapsed * self.max_requests / 60)
+        self.available_tokens = min(self.max_tokens, self.available_tokens + elapsed * self.max_tokens / 60)
+        self.last_update = now
+    
+    async def acquire(self, n_tokens: int):
+        """Wait until there is capacity for one request of n_tokens, then debit it."""
+        # A request larger than the whole bucket could never fit; let it through once full
+        n_tokens = min(n_tokens, self.max_tokens)
+        
+        # Serialize waiters so requests are admitted in arrival order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.available_requests >= 1 and self.available_tokens >= n_tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= n_tokens
+                    return
+                
+                # Sleep just long enough for the scarcer bucket to refill
+                wait = max(
+                    (1 - self.available_requests) * 60 / self.max_requests,
+                    (n_tokens - self.available_tokens) * 60 / self.max_tokens,
+                    0.001
+                )
+                await asyncio.sleep(wait)
+
+# Errors worth retrying; anything else (e.g. BadRequestError) fails the request immediately
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    # Raised unwrapped when the connection drops while reading a stream
+    httpx.TransportError,
+)
+
+def _is_retryable(error: BaseException) -> bool:
+    """
+    Whether a failed attempt is worth retrying.
+    
+    Besides _RETRYABLE_ERRORS, this covers error events sent mid-stream, which
+    the client raises as a bare openai.APIError. Its other subclasses, such as
+    BadRequestError, are not retried.
+    """
+    return isinstance(error, _RETRYABLE_ERRORS) or type(error) is openai.APIError
+
+# Backoff of 1s, 2s, 4s, ... capped at 60s, each with up to 1s of jitter
+_BACKOFF = wait_exponential_jitter(initial=1, max=60)
+
+# Longest server-requested delay honored, matching the openai client's own retry logic
+_MAX_RETRY_AFTER = 60
+
+def _retry_wait(retry_state) -> float:
+    """
+    Seconds to wait before the next attempt, honoring the server's Retry-After on 429s.
+    
+    Args:
+        retry_state: tenacity RetryCallState for the failed attempt
+        
+    Returns:
+        The server-requested delay for rate limit errors if it is at most
+        _MAX_RETRY_AFTER seconds, otherwise exponential backoff
+    """
+    error = retry_state.outcome.exception()
+    if isinstance(error, openai.RateLimitError):
+        headers = error.response.headers
+        retry_after = None
+        try:
+            if headers.get("retry-after-ms"):
+                retry_after = float(headers["retry-after-ms"]) / 1000
+            elif headers.get("retry-after"):
+                retry_after = float(headers["retry-after"])
+        except ValueError:
+            # Retry-After may also be an HTTP date; fall back to backoff
+            pass
+        # Hour-long waits would hold a concurrency slot past the job's time limit
+        if retry_after is not None and 0 < retry_after <= _MAX_RETRY_AFTER:
+            return retry_after
+    return _BACKOFF(retry_state)
+
+@retry(
+    retry=retry_if_exception(_is_retryable),
+    wait=_retry_wait,
+    stop=stop_after_attempt(8),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+async def _call_openai(client: openai.AsyncOpenAI, limiter: _RateLimiter, body: Dict, n_tokens: int) -> Tuple[str, Optional[str]]:
+    """
+    Issue one streamed Chat Completions request, retrying transient failures with backoff.
+    
+    Args:
+        client: Async OpenAI client
+        limiter: Shared RPM/TPM rate limiter, debited on every attempt
+        body: Request parameters from _request_body
+        n_tokens: Estimated tokens for the request
+        
+    Returns:
+        Full message content, assembled from the streamed deltas, and the finish reason
+    """
+    await limiter.acquire(n_tokens)
+    
+    # include_usage adds a final chunk reporting how much of the prompt was served from cache
+    stream = await client.chat.completions.create(**body, stream=True, stream_options={"include_usage": True})
+    parts = []
+    finish_reason = None
+    async for chunk in stream:
+        if chunk.choices:
+            choice = chunk.choices[0]
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        if chunk.usage:
+            details = chunk.usage.prompt_tokens_details
+            cached_tokens = (details.cached_tokens if details else 0) or 0
+            logger.debug("Prompt tokens: %d (%d cached)", chunk.usage.prompt_tokens, cached_tokens)
+    
+    return "".join(parts), finish_reason
+
+@functools.cache
+def _get_summary_cache():
+    """
+    Open the on-disk summary cache on first use.
+    
+    Returns:
+        diskcache.Cache, or None if caching is disabled or unavailable
+    """
+    if not CFG.SUMMARY_CACHE_DIR:
+        return None
+    
+    try:
+        import diskcache
+        return diskcache.Cache(CFG.SUMMARY_CACHE_DIR)
+    except Exception as e:
+        logger.warning("Summary cache unavailable at %s: %s", CFG.SUMMARY_CACHE_DIR, e)
+        return None
+
+def _cache_key(body: Dict) -> str:
+    """Hash everything that determines a response: model, prompts, and sampling parameters."""
+    return hashlib.blake2b(json.dumps(body, sort_keys=True).encode("utf-8"), digest_size=32).hexdigest()
+
+def _cached_content(body: Dict) -> Optional[str]:
+    """Return the cached model response for a request, if any."""
+    cache = _get_summary_cache()
+    if cache is None:
+        return None
+    return cache.get(_cache_key(body))
+
+def _store_content(body: Dict, articles: List[Dict], content: str, finish_reason: Optional[str] = None):
+    """Cache a model response, unless it did not finish normally or did not yield a summary for every article."""
+    cache = _get_summary_cache()
+    if cache is None:
+        return
+    
+    if finish_reason != "stop":
+        if finish_reason == "length":
+            logger.warning("Response hit max_tokens (%d), not caching it", body["max_tokens"])
+        else:
+            logger.warning("Response finished with %s, not caching it", finish_reason)
+        return
+    
+    if not content.strip():
+        return
+    
+    fallbacks = [_fallback_summary(article) for article in articles]
+    if any(summary == fallback for summary, fallback in zip(_parse_summaries(articles, content), fallbacks)):
+        return
+    
+    cache.set(_cache_key(body), content, expire=CFG.SUMMARY_CACHE_TTL_SECONDS)
+
+def _fallback_summary(article: Dict) -> str:
+    """Placeholder used when an article could not be summarized."""
+    return f"Error generating summary for: {article.get('title', 'Unknown title')} [Source: {article.get('source', 'Unknown')}]"
+
+async def _summarize_chunk(client: openai.AsyncOpenAI, sem: asyncio.Semaphore, limiter: _RateLimiter, index: int, total: int, articles: List[Dict]) -> List[str]:
+    """
+    Summarize one group of articles, waiting for a free concurrency slot and rate-limit capacity first.
+    
+    Args:
+        client: Async OpenAI client
+        sem: Semaphore bounding the number of in-flight requests
+        limiter: Shared RPM/TPM rate limiter
+        index: Position of the group in the run
+        total: Number of groups in the run
+        articles: Article dictionaries with fulltext
+        
+    Returns:
+        Summary strings in the same order as articles
+    """
+    # Tokenizing and truncating happen in a worker thread (tiktoken releases the
+    # GIL), so prompt building overlaps with requests already in flight
+    body, n_tokens = await asyncio.to_thread(_prepare_request, articles)
+    
+    cached = _cached_content(body)
+    if cached is not None:
+        logger.info("Using cached summary for request %d/%d", index + 1, total)
+        return _parse_summaries(articles, cached)
+    
+    async with sem:
+        logger.info(
+            "Summarizing request %d/%d (%d article(s), %s): %.50s...",
+            index + 1, total, len(articles), body["model"], articles[0].get("title", "No title")
+        )
+        
+        content, finish_reason = await _call_openai(client, limiter, body, n_tokens)
+        
+        _store_content(body, articles, content, finish_reason)
+        return _parse_summaries(articles, content)
+
+async def iter_summaries(items: List[Dict]) -> AsyncIterator[Tuple[int, str]]:
+    """
+    Summarize articles concurrently, yielding each summary as soon as its request finishes.
+    
+    Articles are sent CFG.ARTICLES_PER_CALL per request, at most
+    CFG.OPENAI_CONCURRENCY at a time and within the configured RPM/TPM limits.
+    
+    Args:
+        items: List of article dictionaries with fulltext
+        
+    Yields:
+        Tuples of (index into items, summary string), in completion order
+    """
+    chunks = _chunk(list(enumerate(items)), CFG.ARTICLES_PER_CALL)
+    
+    # Load the tokenizers once up front; otherwise every worker thread in
+    # _summarize_chunk would miss the empty cache and try the download itself
+    for model in {CFG.OPENAI_MODEL, CFG.OPENAI_MODEL_CHEAP}:
+        await asyncio.to_thread(_get_encoding, model)
+    
+    # Async connections are bound to this event loop, so the pool lives for one run
+    async with httpx.AsyncClient(limits=_http_limits(), timeout=_HTTP_TIMEOUT, http2=True) as http_client:
+        # Retries are handled by _call_openai so they also pass through the rate limiter
+        client = openai.AsyncOpenAI(api_key=CFG.OPENAI_API_KEY, http_client=http_client, max_retries=0)
+        sem = asyncio.Semaphore(CFG.OPENAI_CONCURRENCY)
+        limiter = _RateLimiter(CFG.OPENAI_MAX_REQUESTS_PER_MINUTE, CFG.OPENAI_MAX_TOKENS_PER_MINUTE)
+        
+        tasks = {
+            asyncio.create_task(
+                _summarize_chunk(client, sem, limiter, i, len(chunks), [article for _, article in chunk])
+            ): (i, chunk)
+            for i, chunk in enumerate(chunks)
+        }
+        pending = set(tasks)
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    i, chunk = tasks[task]
+                    try:
+                        summaries = task.result()
+                    except Exception as e:
+                        logger.error("Error summarizing request %d: %s", i + 1, e)
+                        # Add fallback summaries
+                        summaries = [_fallback_summary(article) for _, article in chunk]
+                    
+                    for (index, _), summary in zip(chunk, summaries):
+                        yield index, summary
+        finally:
+            # Consumer stopped early; don't leave requests running
+            for task in pending:
+                task.cancel()
+
+async def _collect_summaries(items: List[Dict]) -> List[str]:
+    """Gather the streamed summaries back into input order."""
+    summaries = [None] * len(items)
+    async for index, summary in iter_summaries(items):
+        summaries[index] = summary
+    return summaries
+
+def summarize_articles_batch(items: List[Dict]) -> List[str]:
+    """
+    Summarize a list of articles through the OpenAI Batch API.
+    
+    Cheaper than individual requests, but results may take a while. Requests are
+    submitted as one batch per model; each is polled until it finishes or
+    CFG.OPENAI_BATCH_MAX_WAIT_SECONDS elapses.
+    
+    Args:
+        items: List of article dictionaries with fulltext
+        
+    Returns:
+        List of summary strings in the same order as input
+        
+    Raises:
+        TimeoutError: If a batch did not finish in time (it is cancelled)
+        RuntimeError: If a batch failed, expired, or was cancelled
+    """
+    chunks = _chunk(items, CFG.ARTICLES_PER_CALL)
+    bodies = [_request_body(chunk) for chunk in chunks]
+    
+    # Response content by chunk index, starting with whatever is already cached
+    results = {}
+    for i, body in enumerate(bodies):
+        cached = _cached_content(body)
+        if cached is not None:
+            results[i] = cached
+    
+    # One request per line for the rest, matched back up by custom_id since output order is not guaranteed.
+    # A batch input file may only use one model, so lines are grouped into one batch per model
+    lines_by_model = {}
+    articles_by_model = {}
+    for i, body in enumerate(bodies):
+        if i in results:
+            continue
+        lines_by_model.setdefault(body["model"], []).append(json.dumps({
+            "custom_id": f"chunk-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": body
+        }))
+        articles_by_model[body["model"]] = articles_by_model.get(body["model"], 0) + len(chunks[i])
+    
+    if not lines_by_model:
+        logger.info("All summaries found in cache, skipping batch")
+    
+    for model, lines in lines_by_model.items():
+        # Only fresh responses are stored; rewriting cache hits would keep pushing back their expiry
+        for i, (content, finish_reason) in _run_batch(lines, articles_by_model[model]).items():
+            _store_content(bodies[i], chunks[i], content, finish_reason)
+            results[i] = content
+    
+    summaries = []
+    for i, chunk in enumerate(chunks):
+        if i not in results:
+            summaries.extend(_fallback_summary(article) for article in chunk)
+        else:
+            summaries.extend(_parse_summaries(chunk, results[i]))
+    
+    logger.info("Generated %d summaries via the Batch API", len(summaries))
+    return summaries
+
+def _run_batch(lines: List[str], article_count: int) -> Dict[int, Tuple[str, Optional[str]]]:
+    """
+    Submit batch request lines and wait for their responses.
+    
+    Args:
+        lines: JSONL request lines with custom_id "chunk-<index>"
+        article_count: Number of articles covered, for logging
+        
+    Returns:
+        Mapping of chunk index to (content, finish reason) for the requests that succeeded
+        
+    Raises:
+        TimeoutError: If the batch did not finish in time (it is cancelled)
+        RuntimeError: If the batch failed, expired, or was cancelled
+    """
+    client = _get_client()
+    
+    input_file = client.files.create(
+        file=("summaries.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info("Submitted batch %s with %d requests for %d articles", batch.id, len(lines), article_count)
+    
+    # Poll with exponential backoff
+    deadline = time.monotonic() + CFG.OPENAI_BATCH_MAX_WAIT_SECONDS
+    delay = 5
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        if time.monotonic() >= deadline:
+            client.batches.cancel(batch.id)
+            raise TimeoutError(f"Batch {batch.id} still {batch.status} after {CFG.OPENAI_BATCH_MAX_WAIT_SECONDS}s")
+        time.sleep(delay)
+        delay = min(delay * 2, 300)
+        batch = client.batches.retrieve(batch.id)
+        logger.debug("Batch %s status: %s", batch.id, batch.status)
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+    
+    results = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") == 200:
+            index = int(record["custom_id"].split("-", 1)[1])
+            choice = response["body"]["choices"][0]
+            content = choice["message"].get("content")
+            if content is None:
+                # Refusals and filtered replies carry no content; only this chunk falls back
+                logger.error("Batch request %s returned no content (finish reason: %s)", record["custom_id"], choice.get("finish_reason"))
+                continue
+            results[index] = (content, choice.get("finish_reason"))
+        else:
+            logger.error("Batch request %s failed: %s", record.get("custom_id"), record.get("error") or response.get("body"))
+    
+    return results
+
 def summarize_articles(items: List[Dict]) -> List[str]:
     """
     Summarize a list of articles using OpenAI.
     
+    Articles are sent CFG.ARTICLES_PER_CALL per request. Uses the Batch API
+    when CFG.OPENAI_USE_BATCH is set, falling back to concurrent requests (at
+    most CFG.OPENAI_CONCURRENCY at a time, within the configured RPM/TPM
+    limits) otherwise or if the batch does not complete.
+    
     Args:
         items: List of article dictionaries with fulltext
         
@@ -69,61 +748,13 @@ def summarize_articles(items: List[Dict]) -> List[str]:
         logger.error("No OpenAI API key configured")
         return []
     
-    # Configure OpenAI client with error handling
-    try:
-        client = openai.OpenAI(api_key=CFG.OPENAI_API_KEY)
-    except TypeError as e:
-        if "proxies" in str(e):
-            # Handle OpenAI client compatibility issue
-            logger.warning("OpenAI client compatibility issue detected, trying alternative approach")
-            import httpx
-            client = openai.OpenAI(
-                api_key=CFG.OPENAI_API_KEY,
-                http_client=httpx.Client()
-            )
-        else:
-            raise e
-    
-    summaries = []
-    
-    for i, article in enumerate(items):
+    if CFG.OPENAI_USE_BATCH:
         try:
-            logger.info(f"Summarizing article {i+1}/{len(items)}: {article.get('title', 'No title')[:50]}...")
-            
-            prompt = create_summary_prompt(article)
-            
-            response = client.chat.completions.create(
-                model=CFG.OPENAI_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You write faithful, concise news summaries with analysis and citations.
-- Summarize core facts in 3-4 bullets.
-- Provide 1-2 sentences of analysis on the significance or implications.
-- Link to the original source using the provided URL; do not invent sources.
-- Keep analysis balanced and fact-based.
-- Target 120-160 words per article."""
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.1,
-                max_tokens=500
-            )
-            
-            summary = response.choices[0].message.content.strip()
-            summaries.append(summary)
-            
-            # Rate limiting - small delay between requests
-            time.sleep(0.5)
-            
+            return summarize_articles_batch(items)
         except Exception as e:
-            logger.error(f"Error summarizing article {i+1}: {e}")
-            # Add a fallback summary
-            fallback = f"Error generating summary for: {article.get('title', 'Unknown title')} [Source: {article.get('source', 'Unknown')}]"
-            summaries.append(fallback)
+            logger.warning("Batch summarization failed, falling back to direct requests: %s", e)
+    
+    summaries = asyncio.run(_collect_summaries(items))
     
-    logger.info(f"Generated {len(summaries)} summaries")
+    logger.info("Generated %d summaries", len(summaries))
     return summaries
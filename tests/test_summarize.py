@@ -0,0 +1,51 @@
+"""
+Tests for the Batch API path of the summarization module.
+"""
+
+import json
+
+import pytest
+
+from src import config
+from src import summarize
+
+@pytest.fixture
+def two_models(monkeypatch):
+    """Configure distinct main and cheap models, with the summary cache disabled."""
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o")
+    monkeypatch.setenv("OPENAI_MODEL_CHEAP", "gpt-4o-mini")
+    monkeypatch.setenv("LONG_ARTICLE_THRESHOLD", "1000")
+    monkeypatch.setenv("ARTICLES_PER_CALL", "1")
+    monkeypatch.setenv("SUMMARY_CACHE_DIR", "")
+    config.get_config.cache_clear()
+    summarize._get_summary_cache.cache_clear()
+    yield
+    config.get_config.cache_clear()
+    summarize._get_summary_cache.cache_clear()
+
+def test_batch_submits_one_batch_per_model(monkeypatch, two_models):
+    """Short and long articles are routed to different models, each in its own batch."""
+    articles = [
+        {"title": "Short one", "source": "BBC", "url": "https://example.com/1", "fulltext": "short " * 10},
+        {"title": "Long one", "source": "NYT", "url": "https://example.com/2", "fulltext": "long " * 500},
+        {"title": "Short two", "source": "Fox", "url": "https://example.com/3", "fulltext": "short " * 20},
+    ]
+
+    submitted = []
+
+    def fake_run_batch(lines, article_count):
+        requests = [json.loads(line) for line in lines]
+        models = {request["body"]["model"] for request in requests}
+        assert len(models) == 1, "a batch input file may only use one model"
+        submitted.append((models.pop(), article_count))
+        return {
+            int(request["custom_id"].split("-", 1)[1]): (f"Summary of {request['custom_id']}", "stop")
+            for request in requests
+        }
+
+    monkeypatch.setattr(summarize, "_run_batch", fake_run_batch)
+
+    summaries = summarize.summarize_articles_batch(articles)
+
+    assert sorted(submitted) == [("gpt-4o", 1), ("gpt-4o-mini", 2)]
+    assert summaries == ["Summary of chunk-0", "Summary of chunk-1", "Summary of chunk-2"]